@@ -0,0 +1,115 @@
+"""WikiArt CLI Startup Benchmark.
+
+Measures how long `wikiart.py --help` and `wikiart.py convert`, on an
+up-to-date tiny data set, take to run and fails if they exceed the time
+budget or if heavy dependencies, which should only be loaded when they are
+actually needed, are imported at startup (checked with
+`python -X importtime`).
+
+Usage: python3 benchmarks/startup.py [--budget MS] [--runs N]
+
+"""
+import argparse
+import os
+import json
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be loaded when importing each module.
+LAZY_MODULES = {
+    'wikiart.console': ('requests', 'urllib3', 'numpy',
+                        'wikiart.fetcher', 'wikiart.converter'),
+    'wikiart.converter': ('requests', 'urllib3', 'numpy'),
+}
+
+
+def import_times(module):
+    """Import `module` in a fresh interpreter and parse `-X importtime`.
+
+    :return: dict, cumulative import time (in us) of each imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+        cwd=ROOT, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def run_time(*args):
+    """Wall time (in ms) of running `wikiart.py` with `args`."""
+    elapsed = time.perf_counter()
+    subprocess.run([sys.executable, 'wikiart.py'] + list(args), cwd=ROOT,
+                   stdout=subprocess.DEVNULL, check=True)
+    return 1000 * (time.perf_counter() - elapsed)
+
+
+def make_datadir(path, n_artists=3, n_paintings=10):
+    """Write the metadata of a tiny fetched data set into `path`."""
+    meta_dir = os.path.join(path, 'meta')
+    os.makedirs(meta_dir)
+
+    artists = [{'contentId': i, 'url': 'artist-%i' % i}
+               for i in range(n_artists)]
+    with open(os.path.join(meta_dir, 'artists.json'), 'w') as f:
+        json.dump(artists, f)
+
+    for artist in artists:
+        paintings = [{'contentId': 1000 * artist['contentId'] + i,
+                      'style': 'style-%i' % (i % 3), 'genre': 'genre',
+                      'artistUrl': artist['url']}
+                     for i in range(n_paintings)]
+        with open(os.path.join(meta_dir, artist['url'] + '.json'), 'w') as f:
+            json.dump(paintings, f)
+
+
+def main():
+    p = argparse.ArgumentParser(description='Benchmark the CLI startup.')
+    p.add_argument('--budget', type=float, default=100,
+                   help='maximum startup time allowed, in milliseconds')
+    p.add_argument('--runs', type=int, default=5,
+                   help='number of runs (the best one is reported)')
+    args = p.parse_args()
+
+    failed = False
+
+    for module, lazy in sorted(LAZY_MODULES.items()):
+        times = import_times(module)
+        print('import %-18s %.2f ms' % (module + ':', times[module] / 1000))
+
+        eager = [m for m in lazy if m in times]
+        if eager:
+            print('error: imported by %s: %s' % (module, ', '.join(eager)))
+            failed = True
+
+    with tempfile.TemporaryDirectory() as datadir:
+        make_datadir(datadir)
+        # The first conversion writes every file. The timed ones find
+        # them up to date.
+        run_time('--datadir', datadir, 'convert')
+
+        for command in (['--help'], ['--datadir', datadir, 'convert']):
+            elapsed = min(run_time(*command) for _ in range(args.runs))
+            name = 'wikiart.py ' + command[-1]
+            print('%-25s %.2f ms (best of %i)' % (name + ':', elapsed,
+                                                   args.runs))
+
+            if elapsed > args.budget:
+                print('error: %s exceeds budget of %.0f ms'
+                      % (name, args.budget))
+                failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -28,5 +28,5 @@ setup(
     url='https://github.com/lucasdavid/wikiart-retriever',
     download_url='https://github.com/lucasdavid/wikiart-retriever/'
                  'archive/master.zip',
-    install_requires=['requests'],
+    install_requires=['numpy', 'requests'],
 )
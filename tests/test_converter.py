@@ -0,0 +1,131 @@
+"""WikiArt Metadata Converter Tests.
+
+Author: Lucas David -- <ld492@drexel.edu>
+License: MIT License (c) 2016
+
+"""
+import json
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from wikiart import settings
+from wikiart.converter import WikiArtMetadataConverter
+
+
+class WikiArtMetadataConverterTest(unittest.TestCase):
+    styles = ('Baroque', 'Cubism', 'Impressionism', None)
+
+    def setUp(self):
+        self.base_folder = settings.BASE_FOLDER
+        self.data_dir = tempfile.mkdtemp()
+        settings.BASE_FOLDER = self.data_dir
+
+        self.random = random.Random(0)
+        self.artists = [{'contentId': i, 'url': 'artist-%i' % i}
+                        for i in range(4)]
+        self.write_meta('artists', self.artists)
+
+        for artist in self.artists:
+            self.add_paintings(artist, 100)
+
+    def tearDown(self):
+        settings.BASE_FOLDER = self.base_folder
+        shutil.rmtree(self.data_dir)
+
+    def write_meta(self, name, data):
+        os.makedirs(os.path.join(self.data_dir, 'meta'), exist_ok=True)
+        with open(os.path.join(self.data_dir, 'meta', name + '.json'), 'w',
+                  encoding='utf-8') as f:
+            json.dump(data, f)
+
+    def add_paintings(self, artist, n, style=None):
+        path = os.path.join(self.data_dir, 'meta', artist['url'] + '.json')
+        paintings = []
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                paintings = json.load(f)
+
+        first = 1000 * artist['contentId'] + len(paintings)
+        paintings += [{'contentId': first + i,
+                       'style': style or self.random.choice(self.styles),
+                       'genre': self.random.choice(('portrait', 'landscape')),
+                       'artistUrl': artist['url']}
+                      for i in range(n)]
+        self.write_meta(artist['url'], paintings)
+
+    def convert(self, **params):
+        (WikiArtMetadataConverter(**params)
+         .prepare()
+         .generate_images_data_set()
+         .generate_encodings())
+
+    def load(self, name):
+        return np.load(os.path.join(self.data_dir, settings.ENCODED_FOLDER,
+                                    name + '.npy'))
+
+    def splits_by_id(self):
+        ids = self.load('contentId')
+        return {int(ids[i]): split for split, _ in settings.SPLITS
+                for i in self.load(split)}
+
+    def codes_by_id(self, attribute):
+        return dict(zip(self.load('contentId').tolist(),
+                        self.load(attribute).tolist()))
+
+    def test_same_seed_gives_same_splits(self):
+        self.convert(seed=7)
+        expected = self.splits_by_id()
+
+        shutil.rmtree(os.path.join(self.data_dir, settings.ENCODED_FOLDER))
+        self.convert(seed=7)
+        self.assertEqual(self.splits_by_id(), expected)
+
+        self.convert(seed=8)
+        self.assertNotEqual(self.splits_by_id(), expected)
+
+    def test_refresh_keeps_splits_and_codes(self):
+        self.convert(seed=7)
+        splits = self.splits_by_id()
+        codes = {attribute: self.codes_by_id(attribute)
+                 for attribute in settings.ENCODED_ATTRIBUTES}
+
+        # New paintings, some of them in a style that sorts before the others.
+        self.add_paintings(self.artists[1], 30)
+        self.add_paintings(self.artists[2], 10, style='Abstract Art')
+        self.convert()
+
+        refreshed = self.splits_by_id()
+        self.assertEqual(len(refreshed), len(splits) + 40)
+        for content_id, split in splits.items():
+            self.assertEqual(refreshed[content_id], split)
+
+        for attribute, previous in codes.items():
+            current = self.codes_by_id(attribute)
+            for content_id, code in previous.items():
+                self.assertEqual(current[content_id], code)
+
+    def test_strata_follow_split_ratios(self):
+        self.convert()
+        self.add_paintings(self.artists[0], 50)
+        self.convert()
+
+        styles = self.load(settings.SPLITS_STRATIFIED_BY)
+        total_ratio = sum(ratio for _, ratio in settings.SPLITS)
+
+        for style in np.unique(styles):
+            members = set(np.flatnonzero(styles == style).tolist())
+
+            for split, ratio in settings.SPLITS:
+                count = len(members.intersection(self.load(split).tolist()))
+                self.assertLessEqual(
+                    abs(count - ratio / total_ratio * len(members)), 1,
+                    'style %i, split %s' % (style, split))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,7 +8,7 @@ License: MIT License (c) 2016
 import argparse
 import time
 
-from . import base, converter, fetcher, settings
+from . import base, settings
 from .base import Logger
 
 
@@ -44,6 +44,13 @@ class Console:
         p_convert = sp.add_parser('convert',
                                   help='Transform collected paintings '
                                        'metadata to data set notation.')
+        p_convert.add_argument('--seed', type=int,
+                               default=None,
+                               help='seed used when splitting paintings into '
+                                    'train, valid and test sets. Paintings '
+                                    'keep their split unless a different seed '
+                                    'is given (default: the seed last used, '
+                                    'or %i)' % settings.SPLITS_SEED)
 
         p_convert.set_defaults(func=self.convert)
 
@@ -75,6 +82,9 @@ class Console:
         return self.fetch(args).convert(args)
 
     def fetch(self, args):
+        # Imported here so `requests` is only loaded when fetching.
+        from . import fetcher
+
         f = fetcher.WikiArtFetcher(override=args.override)
         f.prepare()
 
@@ -97,10 +107,15 @@ class Console:
         return self
 
     def convert(self, args):
-        (converter.WikiArtMetadataConverter(override=args.override)
+        from . import converter
+
+        seed = getattr(args, 'seed', None)
+
+        (converter.WikiArtMetadataConverter(override=args.override, seed=seed)
          .prepare()
          .generate_images_data_set()
-         .generate_labels())
+         .generate_labels()
+         .generate_encodings())
 
         return self
 
@@ -4,6 +4,8 @@ Author: Lucas David -- <ld492@drexel.edu>
 License: MIT License (c) 2016
 
 """
+import hashlib
+import itertools
 import json
 import os
 
@@ -18,11 +20,17 @@ class WikiArtMetadataConverter:
     data-set notation.
     """
 
-    def __init__(self, override=False):
+    def __init__(self, override=False, seed=None):
         self.override = override
+        # None means the seed of the previous conversion, if any, or
+        # `settings.SPLITS_SEED`. Resolved by `load_previous_encodings`.
+        self.seed = seed
 
         self.artists = None
         self.painting_groups = None
+        self.vocabularies = None
+        self.previous_splits = None
+        self.previous_seed = None
 
     def prepare(self):
         base_folder = settings.BASE_FOLDER
@@ -48,17 +56,79 @@ class WikiArtMetadataConverter:
                 Logger.warning(str(error))
 
         Logger.write('done.')
+        return self.load_previous_encodings()
+
+    def load_previous_encodings(self):
+        """Load Vocabularies and Seed From A Previous Conversion.
+
+        They are kept so label codes and split assignments remain stable
+        when the data set is refreshed with new paintings.
+        """
+        encoded_dir = os.path.join(settings.BASE_FOLDER,
+                                   settings.ENCODED_FOLDER)
+
+        self.vocabularies = {}
+        for attribute in settings.ENCODED_ATTRIBUTES:
+            path = os.path.join(encoded_dir, attribute + '.vocab')
+            if os.path.exists(path):
+                with open(path, encoding='utf-8', newline='\n') as f:
+                    self.vocabularies[attribute] = f.read().split('\n')[:-1]
+            else:
+                self.vocabularies[attribute] = []
+
+        seed_path = os.path.join(encoded_dir, 'seed')
+        if os.path.exists(seed_path):
+            with open(seed_path, encoding='utf-8') as f:
+                self.previous_seed = f.read().strip()
+
+        if self.seed is None:
+            self.seed = (settings.SPLITS_SEED if self.previous_seed is None
+                         else int(self.previous_seed))
+
+        return self
+
+    def load_previous_splits(self):
+        """Load Split Assignments From A Previous Conversion.
+
+        Splits made with a seed other than an explicitly given `self.seed`
+        are discarded.
+        """
+        import numpy as np
+
+        encoded_dir = os.path.join(settings.BASE_FOLDER,
+                                   settings.ENCODED_FOLDER)
+
+        self.previous_splits = {}
+        ids_path = os.path.join(encoded_dir, 'contentId.npy')
+        if os.path.exists(ids_path) and self.previous_seed != str(self.seed):
+            Logger.warning('splits were made with seed %s. Re-splitting '
+                           'every painting with seed %s.'
+                           % (self.previous_seed or '(unknown)', self.seed))
+        elif os.path.exists(ids_path):
+            ids = np.load(ids_path)
+            for split, _ in settings.SPLITS:
+                path = os.path.join(encoded_dir, split + '.npy')
+                if os.path.exists(path):
+                    for i in np.load(path):
+                        self.previous_splits[int(ids[i])] = split
+
         return self
 
     def generate_images_data_set(self):
         Logger.info('generating images data set', end=' ', flush=True)
 
         path = os.path.join(settings.BASE_FOLDER, 'wikiart.data')
+        paintings = self.paintings()
+
         if os.path.exists(path) and not self.override:
-            Logger.write('(s)')
-            return self
+            if (self.data_set_ids(path) ==
+                    [p['contentId'] for p in paintings]):
+                Logger.write('(s)')
+                return self
 
-        paintings = sum(self.painting_groups, [])
+            # Rows no longer match the metadata. Rewrite the file so it
+            # stays aligned with the encodings.
+            Logger.write('(outdated)', end=' ')
 
         with open(path, 'w', encoding='utf-8') as f:
             f.write(settings.PAINTINGS_HEADER)
@@ -82,6 +152,186 @@ class WikiArtMetadataConverter:
         Logger.write('(d)')
         return self
 
+    def generate_encodings(self):
+        """Generate Label Encodings and Train/Valid/Test Splits.
+
+        Writes, inside `settings.ENCODED_FOLDER`, one vocabulary file and one
+        integer-encoded `.npy` array per attribute in
+        `settings.ENCODED_ATTRIBUTES`, the paintings' `contentId.npy` and one
+        `.npy` file of row indices per split. Every array is aligned with the
+        rows of wikiart.data and can be memory-mapped with
+        `np.load(path, mmap_mode='r')`.
+
+        Existing encodings are only kept if every file is present and the
+        `checksum` saved with them matches the one of the current paintings'
+        ids, encoded labels and seed (saved in the `seed` file).
+        """
+        Logger.info('generating encodings', end=' ', flush=True)
+
+        encoded_dir = os.path.join(settings.BASE_FOLDER,
+                                   settings.ENCODED_FOLDER)
+        ids_path = os.path.join(encoded_dir, 'contentId.npy')
+        checksum_path = os.path.join(encoded_dir, 'checksum')
+
+        paintings = self.paintings()
+        ids = [p['contentId'] for p in paintings]
+        labels = self.encode_labels(paintings)
+        checksum = self.encodings_checksum(ids, labels)
+
+        if not self.override and all(
+                os.path.exists(os.path.join(encoded_dir, name))
+                for name in self.encoded_files()):
+            with open(checksum_path, encoding='utf-8') as f:
+                if f.read().strip() == checksum:
+                    Logger.write('(s)')
+                    return self
+
+        # NumPy is only needed to write the arrays, so up-to-date encodings
+        # are checked without paying for its import.
+        import numpy as np
+
+        os.makedirs(encoded_dir, exist_ok=True)
+
+        self.load_previous_splits()
+        splits = self.split_indices(ids, labels[settings.SPLITS_STRATIFIED_BY])
+
+        for attribute, vocabulary in self.vocabularies.items():
+            with open(os.path.join(encoded_dir, attribute + '.vocab'), 'w',
+                      encoding='utf-8', newline='\n') as f:
+                f.writelines(label + '\n' for label in vocabulary)
+
+        for attribute, codes in labels.items():
+            np.save(os.path.join(encoded_dir, attribute + '.npy'),
+                    np.array(codes, dtype=np.int32))
+        for split, rows in splits.items():
+            np.save(os.path.join(encoded_dir, split + '.npy'),
+                    np.array(rows, dtype=np.int64))
+        np.save(ids_path, np.array(ids, dtype=np.int64))
+
+        with open(os.path.join(encoded_dir, 'seed'), 'w',
+                  encoding='utf-8') as f:
+            f.write('%s\n' % self.seed)
+
+        with open(checksum_path, 'w', encoding='utf-8') as f:
+            f.write(checksum + '\n')
+
+        Logger.write('(d)')
+        return self
+
+    def encode_labels(self, paintings):
+        """Encode Paintings' Attributes Into Integer Labels.
+
+        New labels are appended to the end of the existing vocabularies,
+        so codes assigned by previous conversions never change.
+        """
+        labels = {}
+
+        for attribute in settings.ENCODED_ATTRIBUTES:
+            vocabulary = self.vocabularies[attribute]
+            codes = {label: code for code, label in enumerate(vocabulary)}
+            values = [self.as_label(p.get(attribute)) for p in paintings]
+
+            for label in sorted(set(values) - set(codes) - {None}):
+                codes[label] = len(vocabulary)
+                vocabulary.append(label)
+
+            labels[attribute] = [-1 if value is None else codes[value]
+                                 for value in values]
+
+        return labels
+
+    def split_indices(self, ids, strata):
+        """Assign Paintings to Splits, Stratified by `strata`.
+
+        Paintings seen by a previous conversion stay in their split. New ones
+        are visited in an order given by `self.seed` and each goes to the split
+        furthest below its target ratio within the painting's stratum.
+
+        :return: dict, sorted row indices of each split.
+        """
+        names = [name for name, _ in settings.SPLITS]
+        total_ratio = sum(ratio for _, ratio in settings.SPLITS)
+        ratios = [ratio / total_ratio for _, ratio in settings.SPLITS]
+
+        strata_members = {}
+        for i, stratum in enumerate(strata):
+            strata_members.setdefault(stratum, []).append(i)
+
+        assignment = [None] * len(ids)
+
+        for members in strata_members.values():
+            counts = [0] * len(names)
+            new = []
+
+            for i in members:
+                split = self.previous_splits.get(ids[i])
+                if split in names:
+                    assignment[i] = names.index(split)
+                    counts[assignment[i]] += 1
+                else:
+                    new.append(i)
+
+            new.sort(key=lambda i: self.split_key(ids[i]))
+            total = sum(counts)
+
+            for i in new:
+                total += 1
+                deficits = [ratio * total - count
+                            for ratio, count in zip(ratios, counts)]
+                assignment[i] = deficits.index(max(deficits))
+                counts[assignment[i]] += 1
+
+        return {name: [i for i, a in enumerate(assignment) if a == split]
+                for split, name in enumerate(names)}
+
+    def encodings_checksum(self, ids, labels):
+        """Digest of the ids, encoded labels, vocabularies and seed."""
+        content = json.dumps({'seed': str(self.seed),
+                              'contentId': ids,
+                              'labels': labels,
+                              'vocabularies': self.vocabularies},
+                             sort_keys=True)
+        return hashlib.md5(content.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def encoded_files(cls):
+        """Names of every file written by `generate_encodings`."""
+        return ([attribute + extension
+                 for attribute in settings.ENCODED_ATTRIBUTES
+                 for extension in ('.vocab', '.npy')] +
+                [split + '.npy' for split, _ in settings.SPLITS] +
+                ['contentId.npy', 'seed', 'checksum'])
+
+    def paintings(self):
+        return list(itertools.chain.from_iterable(self.painting_groups))
+
+    @classmethod
+    def data_set_ids(cls, path):
+        """Read the contentId column of an existing wikiart.data.
+
+        :return: list, the ids of every row, or None if the file can't be
+                 parsed.
+        """
+        with open(path, encoding='utf-8', newline='') as f:
+            lines = f.read().split('\n')
+
+        try:
+            return [int(line.split(',', 1)[0]) for line in
+                    lines[settings.PAINTINGS_HEADER.count('\n'):] if line]
+        except ValueError:
+            return None
+
+    def split_key(self, content_id):
+        return hashlib.md5(('%s:%i' % (self.seed, content_id))
+                           .encode('utf-8')).hexdigest()
+
+    @classmethod
+    def as_label(cls, value):
+        if value is None or value == '':
+            return None
+        # Labels are saved one per line, so no line breaks are allowed.
+        return ' '.join(str(value).splitlines()).strip() or None
+
     @classmethod
     def paintings_as_lines(cls, paintings):
         return cls.convert_to_lines(paintings, settings.PAINTING_ATTRIBUTES)
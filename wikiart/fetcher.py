@@ -9,7 +9,6 @@ import os
 import shutil
 import time
 import urllib.error
-import urllib.request
 import re
 
 import requests
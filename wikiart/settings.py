@@ -70,3 +70,23 @@ or to report a bug.
 
 %s
 """ % ','.join(ARTIST_ATTRIBUTES)
+
+# Label Encoding and Splitting Settings
+
+# Name of the folder (inside BASE_FOLDER) in which vocabularies, encoded
+# labels and split indices are saved.
+ENCODED_FOLDER = 'encoded'
+
+# Painting attributes that are encoded into integer labels. Each one yields a
+# vocabulary file (one label per line, line number is the code) and a NumPy
+# array aligned with the rows of wikiart.data. Missing labels are coded as -1.
+ENCODED_ATTRIBUTES = ('style', 'genre', 'artistUrl')
+
+# Splits generated and the fraction of paintings that goes to each one of them.
+SPLITS = (('train', .7), ('valid', .1), ('test', .2))
+
+# Attribute by which the splits are stratified.
+SPLITS_STRATIFIED_BY = 'style'
+
+# Seed used when assigning paintings to splits.
+SPLITS_SEED = 42